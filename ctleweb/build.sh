@@ -27,7 +27,7 @@ function all {
 }
 
 function run_tests {
-    python manage.py test projtrack.tests
+    python manage.py test projtrack.tests d2lstat.tests
 }
 
 function clean {
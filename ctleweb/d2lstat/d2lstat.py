@@ -23,7 +23,7 @@ import os
 from django.conf import settings
 
 # GLOBAL SETTINGS - DO NOT CHANGE UNLESS ABSOLUTELY NECESSARY.
-DELIMITER = '|'  # Determines what character the program wil break data rows on.
+COURSE = 9  # The column holding the course code, which contains the semester and ends with the CRN.
 ASSIGNMENTS = 13  # The column that assignments data is located in.
 GRADE = 15  # The column that grade item data is located in.
 GRADED = 16  # The column that graded grade item data is located in.
@@ -31,72 +31,124 @@ DISCUSSION = 18  # The column for discussion post usage.
 USAGE_ROYAL = 3  # The column where the instructor's R number is located in the usage file.
 FAC_ROYAL = 0  # Where the faculty member's R number is located in the full-/part-time CSV files.
 
+READ_BUFFER = 1 << 20  # The buffer size used when reading the uploaded CSV files.
 
-def filter_for_semester(files_data, semester):
+REPORT_TEMPLATE = None  # The contents of raw_html.html, loaded by load_report_template.
+
+
+def iter_csv(file_name, contains=None):
     """
-    Used to filter the entire set of usage data for a given semester.
+    Streams the rows of a CSV file one at a time, closing the file once they have all been read.
 
-    :param files_data: The list of all course data taken from the usage CSV file.
+    :param file_name: The name of the CSV file.
+    :param contains: (Optional) Only lines containing this text are parsed; the rest are skipped before the CSV parser
+    sees them. This assumes every record sits on a single line, which holds for the D2L exports.
+    :return: An iterator over the rows in the file, each already split into its columns.
+    """
+    with open(file_name, mode='r', newline='', buffering=READ_BUFFER) as infile:
+        lines = infile if contains is None else (line for line in infile if contains in line)
+        for row in csv.reader(lines, dialect='excel', delimiter=',', quotechar='"'):
+            yield row
+
+
+def read_csv(file_name, contains=None):
+    """
+    Reads an entire CSV file into memory.
+
+    :param file_name: The name of the CSV file.
+    :param contains: (Optional) Only lines containing this text are kept, as in iter_csv.
+    :return: The list of rows in the file, each already split into its columns.
+    """
+    return list(iter_csv(file_name, contains))
+
+
+def load_faculty(file_name):
+    """
+    Reads a full- or part-time faculty CSV file and indexes it by R number.
+
+    :param file_name: The name of the faculty CSV file.
+    :return: The list of rows in the file, and a dictionary mapping each R number to its row. If an R number is
+    repeated, the last row for it wins. Blank lines are skipped.
+    """
+    rows = [row for row in iter_csv(file_name) if row]
+    return rows, {row[FAC_ROYAL]: row for row in rows}
+
+
+def in_semester(row, semester):
+    """
+    Checks whether a row of the usage data belongs to the given semester.
+
+    :param row: A row from the usage CSV file.
     :param semester: The year and semester (e.g. 2018_Fall) to search for in the usage data.
-    :return: The list of courses pertaining to the given semester.
+    :return: True if the row's course code contains the semester.
     """
-    final = list()
-    for x in files_data:
-        y = x.split(DELIMITER)
-        if semester in y[9]:  # NOTE This will always work, provided the semester string is given correctly.
-            final.append(x)
-    return final
+    # NOTE This will always work, provided the semester string is given correctly.
+    # The export does not guarantee the semester is a prefix of the course code, so this stays a substring test.
+    return semester in row[COURSE]
 
 
-def get_rows_with_usage(files_data):
+def is_above(value, threshold):
     """
-    Filters the semester's courses on which ones had activity in D2L.
+    Checks a usage number from the CSV against a threshold.
 
-    :param files_data: The filtered list of courses for the semester.
-    :return: The list of courses that had relevant usage in D2L.
+    :param value: The number as it appears in the usage CSV file.
+    :param threshold: The value the number has to exceed.
+    :return: True if the value is a whole number greater than the threshold. Blank or malformed values are False.
     """
-    final = list()
-    for x in files_data:
-        y = x.split(DELIMITER)
-        if int(y[ASSIGNMENTS]) > 0 or int(y[GRADE]) > 2 or int(y[GRADED]) > 0 or int(y[DISCUSSION]) > 0:
-            final.append(x)
-    return final
+    return value.isdecimal() and int(value) > threshold
 
 
-def remove_duplicate_crn(files_data):
+def is_complete(row):
     """
-    Makes sure that none of the courses in the list repeat.
+    Checks whether a row of the usage data is long enough to hold every usage column.
 
-    :param files_data: Filtered data passed in from get_rows_with_usage.
-    :return: The list of coures without any repeated.
+    :param row: A row from the usage CSV file.
+    :return: True if the row reaches the discussion column. Shorter rows are malformed and get skipped.
     """
-    seen_crns = []
-    ret_val = []
-    for x in files_data:
-        y = x.split(DELIMITER)
-        # This checks the last 5 characters of y[9] for a CRN.
-        # Make sure this is where the CRN is still located before running.
-        if y[9][-5:] not in seen_crns:
-            seen_crns.append(y[9][-5:])
-            ret_val.append(x)
-    return ret_val
+    return len(row) > DISCUSSION
 
 
-def remove_duplicate_royal(files_data):
+def has_usage(row):
     """
-    Filters and removes duplicate instructor RIDs.
+    Checks whether a course had relevant activity in D2L.
 
-    :param files_data: Filtered data passed in from get_rows_with_usage.
-    :return: The list of courses with no instructor R numbers duplicated.
+    :param row: A row from the usage CSV file.
+    :return: True if the course used assignments, more than 2 grade items, graded grade items or discussions.
     """
-    seen_royal = []
-    ret_val = []
-    for x in files_data:
-        y = x.split(DELIMITER)
-        if y[USAGE_ROYAL] not in seen_royal:
-            seen_royal.append(y[USAGE_ROYAL])
-            ret_val.append(x)
-    return ret_val
+    return (is_above(row[ASSIGNMENTS], 0) or is_above(row[GRADE], 2) or is_above(row[GRADED], 0) or
+            is_above(row[DISCUSSION], 0))
+
+
+def build_views(files_data, semester):
+    """
+    Filters the usage data down to the semester's courses with D2L activity in a single pass.
+
+    :param files_data: The list of all course data taken from the usage CSV file.
+    :param semester: The year and semester (e.g. 2018_Fall) to search for in the usage data.
+    :return: The courses with usage, the same courses without repeated CRNs, and the same courses without repeated
+    instructor R numbers.
+    """
+    with_usage = []
+    no_dup_crn = []
+    no_dup_r = []
+    seen_crns = set()
+    seen_royal = set()
+    for row in files_data:
+        if not is_complete(row) or not in_semester(row, semester):
+            continue
+        if not has_usage(row):
+            continue
+        with_usage.append(row)
+        # This checks the last 5 characters of the course code for a CRN.
+        # Make sure this is where the CRN is still located before running.
+        crn = row[COURSE][-5:]
+        if crn not in seen_crns:
+            seen_crns.add(crn)
+            no_dup_crn.append(row)
+        if row[USAGE_ROYAL] not in seen_royal:
+            seen_royal.add(row[USAGE_ROYAL])
+            no_dup_r.append(row)
+    return with_usage, no_dup_crn, no_dup_r
 
 
 def parse_files(usage, full_time, part_time, semester, total_courses):
@@ -110,59 +162,19 @@ def parse_files(usage, full_time, part_time, semester, total_courses):
     :param total_courses: (Provided externally) The number of courses running for the given semester.
     :return: A data structure containing all of the data required for the rest of the program.
     """
-    with open(usage, mode='rU') as infile:
-        reader = csv.reader(infile, dialect='excel', delimiter=',', quotechar='"')
-        rows = list()
-        for row in reader:
-            rows.append(row)
-        with open(usage, mode='w') as outfile:
-            writer = csv.writer(outfile, delimiter=DELIMITER)
-            writer.writerows(rows)
-    with open(full_time, mode='rU') as infile:
-        reader = csv.reader(infile, dialect='excel', delimiter=',', quotechar='"')
-        rows = list()
-        for row in reader:
-            rows.append(row)
-        with open(full_time, mode='w') as outfile:
-            writer = csv.writer(outfile, delimiter=DELIMITER)
-            writer.writerows(rows)
-    with open(part_time, mode='rU') as infile:
-        reader = csv.reader(infile, dialect='excel', delimiter=',', quotechar='"')
-        rows = list()
-        for row in reader:
-            rows.append(row)
-        with open(part_time, mode='w') as outfile:
-            writer = csv.writer(outfile, delimiter=DELIMITER)
-            writer.writerows(rows)
-    one = filter_for_semester(open(usage, 'r').readlines(), semester)
-    two = get_rows_with_usage(one)
-    usage_file = remove_duplicate_crn(two)
-    no_dup_r = remove_duplicate_royal(two)
-    full_time_file = open(full_time, 'r').readlines()
-    full_r = list()
-    part_r = list()
-    for x in full_time_file:
-        y = x.split(DELIMITER)
-        full_r.append(y[FAC_ROYAL])
-    part_time_file = open(part_time, 'r').readlines()
-    for x in part_time_file:
-        y = x.split(DELIMITER)
-        part_r.append(y[FAC_ROYAL])
+    two, usage_file, no_dup_r = build_views(iter_csv(usage, semester), semester)
+    full_time_file, full_r = load_faculty(full_time)
+    part_time_file, part_r = load_faculty(part_time)
     full = list()
     part = list()
     staff = list()
-    for x in range(len(part_r)):
-        part_r[x] = part_r[x].strip("\"")
-    for x in range(len(full_r)):
-        full_r[x] = full_r[x].strip("\"")
-    for x in no_dup_r:
-        y = x.split(DELIMITER)
-        if y[USAGE_ROYAL] in full_r:
-            full.append(y)
-        elif y[USAGE_ROYAL] in part_r:
-            part.append(y)
+    for row in no_dup_r:
+        if row[USAGE_ROYAL] in full_r:
+            full.append(row)
+        elif row[USAGE_ROYAL] in part_r:
+            part.append(row)
         else:
-            staff.append(y)
+            staff.append(row)
     return {'semester_no_dup_crn': usage_file,
             'semester_no_dup_r': no_dup_r,
             'semester': two,
@@ -174,6 +186,18 @@ def parse_files(usage, full_time, part_time, semester, total_courses):
             'total_courses': total_courses}
 
 
+def count_above(courses, column, threshold):
+    """
+    Counts the courses whose value in one of the numeric usage columns is above a threshold.
+
+    :param courses: The list of course rows to count.
+    :param column: The column holding the usage number.
+    :param threshold: The value the usage number has to exceed.
+    :return: The number of courses above the threshold. Blank or malformed values are not counted.
+    """
+    return sum(1 for row in courses if is_above(row[column], threshold))
+
+
 def calculate_stats(file_data):
     """
     Carries out the actual logic for generating the numbers that will be included in the report.
@@ -181,22 +205,13 @@ def calculate_stats(file_data):
     :param file_data: The data produced by the parse function.
     :return: The statistics data required for the report generator.
     """
+    courses = file_data['semester_no_dup_crn']
     specifics = {
-        'assignments': 0,
-        'grade': 0,
-        'graded': 0,
-        'discussion': 0
+        'assignments': count_above(courses, ASSIGNMENTS, 0),
+        'grade': count_above(courses, GRADE, 2),
+        'graded': count_above(courses, GRADED, 0),
+        'discussion': count_above(courses, DISCUSSION, 0)
     }
-    for course in file_data['semester_no_dup_crn']:
-        x = course.split(DELIMITER)
-        if int(x[ASSIGNMENTS]) > 0:
-            specifics['assignments'] += 1
-        if int(x[GRADE]) > 2:
-            specifics['grade'] += 1
-        if int(x[GRADED]) > 0:
-            specifics['graded'] += 1
-        if int(x[DISCUSSION]) > 0:
-            specifics['discussion'] += 1
     return {'semester': file_data['semester'],
             'courses_with_usage': len(file_data['semester_no_dup_crn']),
             'faculty_with_usage': len(file_data['semester_no_dup_r']),
@@ -209,6 +224,19 @@ def calculate_stats(file_data):
             'total_courses': file_data['total_courses']}
 
 
+def load_report_template():
+    """
+    Reads the raw HTML report template, keeping it in memory after the first call.
+
+    :return: The contents of raw_html.html, ready to be filled in with str.format_map.
+    """
+    global REPORT_TEMPLATE
+    if REPORT_TEMPLATE is None:
+        with open(os.path.join(settings.BASE_DIR, 'd2lstat/templates/d2lstat/raw_html.html'), 'r') as f:
+            REPORT_TEMPLATE = f.read()
+    return REPORT_TEMPLATE
+
+
 def generate_document(stats, semester):
     """
     Generates an HTML document and PDF with the requested stats for the semester's D2L usage.
@@ -216,24 +244,29 @@ def generate_document(stats, semester):
     :param stats: The dictionary returned by the generate_stats function.
     :param semester: The semester value passed in as a command-line argument.
     """
-    with open(os.path.join(settings.BASE_DIR, 'd2lstat/templates/d2lstat/raw_html.html'), 'r') as f:
-        string = f.read()
-    string = string.format(semester,
-                           stats['faculty_with_usage'],
-                           stats['full_time'],
-                           stats['total_full_time'],
-                           round((stats['full_time'] / stats['total_full_time']) * 100, 1),
-                           stats['part_time'],
-                           stats['total_part_time'],
-                           round((stats['part_time'] / stats['total_part_time']) * 100, 1),
-                           stats['staff'],
-                           stats['courses_with_usage'],
-                           stats['total_courses'],
-                           round((stats['courses_with_usage'] / int(stats['total_courses'])) * 100, 1),
-                           stats['specifics']['assignments'],
-                           stats['specifics']['grade'],
-                           stats['specifics']['graded'],
-                           stats['specifics']['discussion'])
+    total_courses = int(stats['total_courses'])
+    full_time_percent = stats['full_time'] / stats['total_full_time'] * 100
+    part_time_percent = stats['part_time'] / stats['total_part_time'] * 100
+    courses_percent = stats['courses_with_usage'] / total_courses * 100
+    # The percentages are rounded to one decimal place by the format specs in the template.
+    string = load_report_template().format_map({
+        'semester': semester,
+        'faculty_with_usage': stats['faculty_with_usage'],
+        'full_time': stats['full_time'],
+        'total_full_time': stats['total_full_time'],
+        'full_time_percent': full_time_percent,
+        'part_time': stats['part_time'],
+        'total_part_time': stats['total_part_time'],
+        'part_time_percent': part_time_percent,
+        'staff': stats['staff'],
+        'courses_with_usage': stats['courses_with_usage'],
+        'total_courses': total_courses,
+        'courses_percent': courses_percent,
+        'assignments': stats['specifics']['assignments'],
+        'grade': stats['specifics']['grade'],
+        'graded': stats['specifics']['graded'],
+        'discussion': stats['specifics']['discussion']
+    })
     with open(os.path.join(settings.BASE_DIR, 'd2lstat/templates/d2lstat/report.html'), 'w') as f:
         f.write(string)
         f.close()
@@ -256,29 +289,21 @@ def process_file(usage, full_time, part_time, semester, total_courses):
 def calculateVirtualClassroomStats(usage, fullTime, partTime, VCDataFile):
     resultList = []
     # read in the data from the lti (learning tools integration) file
-    virtualClassroomDataFile = open(VCDataFile, 'rU')
-    virtualClassroomDataReader = csv.reader(virtualClassroomDataFile)
-    virtualClassroomData = []
-    seenVirtualClassRoomOrgUnitIds = []
-    for row in virtualClassroomDataReader:
-        if ('youseeu' in row[5] and row[
-            1] not in seenVirtualClassRoomOrgUnitIds):  # get the org unit ids of the courses in which there was created at least one virtual classroom meeting
-            virtualClassroomData.append(row)
-            seenVirtualClassRoomOrgUnitIds.append(row[1])
+    seenVirtualClassRoomOrgUnitIds = set()
+    for row in iter_csv(VCDataFile):
+        if ('youseeu' in row[5]):  # get the org unit ids of the courses in which there was created at least one virtual classroom meeting
+            seenVirtualClassRoomOrgUnitIds.add(row[1])
     # read in the instructor usage data file that was obtained from desire 2 learn data hub
-    instructorUsageDataFile = open(usage, 'rU')
-    instructorUsageDataReader = csv.reader(instructorUsageDataFile)
-    instructorUsageData = []
-    seenRIds = []
+    seenRIds = set()
     numberOfFacultyMembersUsingVirtualClassroom = 0
     fullDataOnInstructors = []
     # print('Instructors That Have Created at Least 1 Virtual Classroom Meeting:')
     resultList.append('Instructors That Have Created at Least 1 Virtual Classroom Meeting:')
-    for row in instructorUsageDataReader:
+    for row in iter_csv(usage):
         if (row[
             10] in seenVirtualClassRoomOrgUnitIds):  # filter the rows to just be the rows for faculty members that have created at least one virtual classroom meeting
             if (row[3] not in seenRIds):  # make sure that each instructor is onlt accounted for once
-                seenRIds.append(row[3])
+                seenRIds.add(row[3])
                 fullDataOnInstructors.append([row[3], row[1], row[2]])
                 # print(row[3] + ': ' + row[1] + ', ' + row[2])
                 resultList.append(row[3] + ': ' + row[1] + ', ' + row[2])
@@ -288,45 +313,27 @@ def calculateVirtualClassroomStats(usage, fullTime, partTime, VCDataFile):
     #     numberOfFacultyMembersUsingVirtualClassroom))
     resultList.append('Number of Instructors That Have Created at Least 1 Virtual Classroom Meeting: ' + str(
         numberOfFacultyMembersUsingVirtualClassroom))
-    seenFullAndPartTimeRIds = []  # this is needed to keep track of the Rids that belong to either full or part time faculty members in order to determine which rids are left over, the left over rids are the rids of staff members teaching part time
+    seenFullAndPartTimeRIds = set()  # this is needed to keep track of the Rids that belong to either full or part time faculty members in order to determine which rids are left over, the left over rids are the rids of staff members teaching part time
     # Full time faculty members that have created at least one virtual classroom meeting
-    fullTimeFacultyDataFile = open(fullTime, 'rU')
-    fullTimeFacultyDataReader = csv.reader(fullTimeFacultyDataFile)
-    fullTimeFacultyUsingVirtualClassroomRids = []
-    for row in fullTimeFacultyDataReader:
-        if (row[0] in seenRIds):
-            fullTimeFacultyUsingVirtualClassroomRids.append(row[0])
-            seenFullAndPartTimeRIds.append(row[0])
+    fullTimeByRid = load_faculty(fullTime)[1]
+    fullTimeFacultyUsingVirtualClassroomRids = [rid for rid in fullTimeByRid if rid in seenRIds]
+    seenFullAndPartTimeRIds.update(fullTimeFacultyUsingVirtualClassroomRids)
     # Part time faculty members that have created at least one virtual classroom meeting
-    partTimeFacultyDataFile = open(partTime, 'rU')
-    partTimeFacultyDataReader = csv.reader(partTimeFacultyDataFile)
-    partTimeFacultyUsingVirtualClassroomRids = []
-    for row in partTimeFacultyDataReader:
-        if (row[0] in seenRIds):
-            partTimeFacultyUsingVirtualClassroomRids.append(row[0])
-            seenFullAndPartTimeRIds.append(row[0])
+    partTimeByRid = load_faculty(partTime)[1]
+    partTimeFacultyUsingVirtualClassroomRids = [rid for rid in partTimeByRid if rid in seenRIds]
+    seenFullAndPartTimeRIds.update(partTimeFacultyUsingVirtualClassroomRids)
     staffTeachingPartTimeRids = []
     for rid in seenRIds:
         if (rid in seenFullAndPartTimeRIds):
             staffTeachingPartTimeRids.append(rid)
     # sort full instructor data based upon the rids in each category
-    fullTimeFacultyUsingVC = []
-    partTimeFacultyUsingVC = []
-    staffUsingVC = []
+    instructorByRid = {row[0]: row for row in fullDataOnInstructors}
     # sort out full time faculty
-    for rid in fullTimeFacultyUsingVirtualClassroomRids:
-        for row in fullDataOnInstructors:
-            if (row[0] == rid):
-                fullTimeFacultyUsingVC.append(row)
+    fullTimeFacultyUsingVC = [instructorByRid[rid] for rid in fullTimeFacultyUsingVirtualClassroomRids]
     # sort out part time faculty
-    for rid in partTimeFacultyUsingVirtualClassroomRids:
-        for row in fullDataOnInstructors:
-            if (row[0] == rid):
-                partTimeFacultyUsingVC.append(row)
+    partTimeFacultyUsingVC = [instructorByRid[rid] for rid in partTimeFacultyUsingVirtualClassroomRids]
     # sort out staff
-    for row in fullDataOnInstructors:
-        if (row[0] not in seenFullAndPartTimeRIds):
-            staffUsingVC.append(row)
+    staffUsingVC = [row for row in fullDataOnInstructors if row[0] not in seenFullAndPartTimeRIds]
     resultList.append("Full Time Faculty Using Virtual Classroom:")
     # print("Full Time Faculty Using Virtual Classroom:")
     for row in fullTimeFacultyUsingVC:
@@ -353,74 +360,37 @@ def calculateVirtualClassroomStats(usage, fullTime, partTime, VCDataFile):
 
 def facultyNotUsingD2LCalculation(usage, fullTime, partTime, semester):
     resultList = []
-    usageFile = open(usage, 'rU')
-    fullTimeFile = open(fullTime, 'rU')
-    partTimeFile = open(partTime, 'rU')
-    usageFileReader = csv.reader(usageFile)
-    fullTimeFileReader = csv.reader(fullTimeFile)
-    partTimeFileReader = csv.reader(partTimeFile)
-    usageDataRaw = []
-    usageData = []
-    fullTimeDataRaw = []
-    partTimeDataRaw = []
     fullTimeNotUsing = []
     partTimeNotUsing = []
     staffTeachingPartTimeNotUsing = []
-    fullTimeRIds = []
-    partTimeRIds = []
-    ridsOfInstructorsUsing = []
-    seenRidsOfInstructorsUsing = []
-    ridsOfInstructorsUsingDuplicatesRemoved = []
-    # read in the usage data
-    for row in usageFileReader:
-        usageDataRaw.append(row)
-    # Get the rids of the instructors using D2L
-    for row in usageDataRaw:
-        # print(row[13] + ',' +row[15] + ',' +row[16] + ',' +row[18])
-        try:
-            if((int(row[13])>0 or int(row[15])>2 or int(row[16])>0 or int(row[18])>0)):
-                if(semester in row[9]):
-                    ridsOfInstructorsUsing.append(row[3])
-        except Exception:
-            print(Exception)
-    seenRIds = []
-    # Filter the rids of instuctors using for duplicates
-    for row in ridsOfInstructorsUsing:
-        if(row not in seenRidsOfInstructorsUsing):
-            ridsOfInstructorsUsingDuplicatesRemoved.append(row)
-            seenRidsOfInstructorsUsing.append(row)
-    #get the Rids of instructors not using
-    for row in usageDataRaw:
-        if(row[3] not in ridsOfInstructorsUsingDuplicatesRemoved and semester in row[9]):
-            usageData.append(row)
-    for row in fullTimeFileReader:
-        fullTimeDataRaw.append(row)
-    for row in partTimeFileReader:
-        partTimeDataRaw.append(row)
-    for row in fullTimeDataRaw:
-        fullTimeRIds.append(row[0])
-    for row in partTimeDataRaw:
-        partTimeRIds.append(row[0])
+    ridsOfInstructorsUsing = set()
+    candidateRows = []
+    # Stream the usage data, getting the rids of the instructors using D2L and holding on to the rest of the
+    # semester's rows
+    for row in iter_csv(usage, semester):
+        if(not is_complete(row) or not in_semester(row, semester)):
+            continue
+        if(has_usage(row)):
+            ridsOfInstructorsUsing.add(row[3])
+        else:
+            candidateRows.append(row)
+    seenRIds = set()
+    #get the rows of instructors not using
+    usageData = [row for row in candidateRows if row[3] not in ridsOfInstructorsUsing]
+    # index the faculty rows by rid so each department lookup is a single dictionary access
+    fullTimeByRid = load_faculty(fullTime)[1]
+    partTimeByRid = load_faculty(partTime)[1]
     for row in usageData:
-        if(row[3] in fullTimeRIds and row[3] not in seenRIds):
-            fullTimeDepartment = ''
-            for fullTimeRow in fullTimeDataRaw:
-                if(row[3]==fullTimeRow[0]):
-                    fullTimeDepartment = fullTimeRow[5]
-            fullTimeNotUsing.append([row[3], row[1], row[2], fullTimeDepartment])
-            seenRIds.append(row[3])
-        elif(row[3] in partTimeRIds and row[3] not in seenRIds):
-            if(row[3] in partTimeRIds):
-                partTimeDepartment = ''
-                for partTimeRow in partTimeDataRaw:
-                    if(row[3]==partTimeRow[0]):
-                        partTimeDepartment = partTimeRow[5]
-                partTimeNotUsing.append([row[3], row[1], row[2], partTimeDepartment])
-                seenRIds.append(row[3])
+        if(row[3] in fullTimeByRid and row[3] not in seenRIds):
+            fullTimeNotUsing.append([row[3], row[1], row[2], fullTimeByRid[row[3]][5]])
+            seenRIds.add(row[3])
+        elif(row[3] in partTimeByRid and row[3] not in seenRIds):
+            partTimeNotUsing.append([row[3], row[1], row[2], partTimeByRid[row[3]][5]])
+            seenRIds.add(row[3])
         else:
             if(row[3] not in seenRIds):
                 staffTeachingPartTimeNotUsing.append([row[3], row[1], row[2]])
-                seenRIds.append(row[3])
+                seenRIds.add(row[3])
     resultList.append('The Total Number of Faculty Not Using Desire 2 Learn: ' + str(len(fullTimeNotUsing)+len(partTimeNotUsing) + len(staffTeachingPartTimeNotUsing)))
     resultList.append('The Number of Full Time Faculty Not Using D2L: ' + str(len(fullTimeNotUsing)))
     resultList.append('Full Time Faculty Not Using Desire 2 Learn:')
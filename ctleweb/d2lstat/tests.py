@@ -1 +1,141 @@
-# Create your tests here.
+import csv
+import os
+import tempfile
+
+import django.test
+
+from .d2lstat import (calculate_stats, calculateVirtualClassroomStats, facultyNotUsingD2LCalculation, has_usage,
+                      is_above, is_complete, parse_files)
+
+SEMESTER = '2018_Fall'
+
+
+def usage_row(rid, last, first, course, org, assignments='0', grade='0', graded='0', discussion='0'):
+    row = [''] * 19
+    row[1] = last
+    row[2] = first
+    row[3] = rid
+    row[9] = course
+    row[10] = org
+    row[13] = assignments
+    row[15] = grade
+    row[16] = graded
+    row[18] = discussion
+    return row
+
+
+def faculty_row(rid, department):
+    return [rid, '', '', '', '', department]
+
+
+USAGE = [
+    # Full time, uses assignments; the blank discussion cell must not break the counts.
+    usage_row('R001', 'Smith', 'Ann', '2018_Fall_ENG101_10001', 'A', assignments='3', discussion=''),
+    # The same instructor again, in a second course.
+    usage_row('R001', 'Smith', 'Ann', '2018_Fall_ENG102_10002', 'B', discussion='1'),
+    # Part time, in a course whose CRN repeats the one above.
+    usage_row('R002', 'Jones', 'Bob', '2018_Fall_MTH101_10002', 'C', grade='5'),
+    # Staff teaching part time.
+    usage_row('R003', 'Brown', 'Cal', '2018_Fall_CHM101_10003', 'D', graded='2'),
+    # No usage: two grade items is not more than two, and blank cells are no activity.
+    usage_row('R004', 'Green', 'Dee', '2018_Fall_BIO101_10004', 'E', grade='2'),
+    usage_row('R005', 'White', 'Eve', '2018_Fall_HIS101_10005', 'F', '', '', '', ''),
+    usage_row('R006', 'Black', 'Fay', '2018_Fall_ART101_10006', 'G'),
+    # Cut short, so it is skipped.
+    ['', 'Short', 'Row', 'R009', '', '', '', '', '', '2018_Fall_PHY101_10009', 'I', '3'],
+    # Another semester.
+    usage_row('R007', 'Gray', 'Gus', '2018_Spring_ENG101_20001', 'H', assignments='9'),
+]
+
+# Both faculty files end with a blank line, which is not counted.
+FULL_TIME = [faculty_row('R001', 'English'), faculty_row('R004', 'Biology'), faculty_row('R007', 'English'),
+             faculty_row('R008', 'Physics'), []]
+
+PART_TIME = [faculty_row('R002', 'Math'), faculty_row('R005', 'History'), []]
+
+VIRTUAL_CLASSROOM = [
+    ['', 'A', '', '', '', 'youseeu meeting'],
+    ['', 'B', '', '', '', 'another tool'],
+    ['', 'C', '', '', '', 'youseeu meeting'],
+    ['', 'D', '', '', '', 'youseeu meeting'],
+]
+
+
+class D2LStatTestCase(django.test.SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.usage = self.write_csv('usage.csv', USAGE)
+        self.full = self.write_csv('full.csv', FULL_TIME)
+        self.part = self.write_csv('part.csv', PART_TIME)
+        self.vc = self.write_csv('vc.csv', VIRTUAL_CLASSROOM)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_csv(self, name, rows):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', newline='') as f:
+            csv.writer(f).writerows(rows)
+        return path
+
+
+class TestUsageChecks(django.test.SimpleTestCase):
+    def test_is_above(self):
+        self.assertTrue(is_above('3', 2))
+        self.assertFalse(is_above('2', 2))
+        self.assertFalse(is_above('', 0))
+        self.assertFalse(is_above('-1', 0))
+        self.assertFalse(is_above('²', 0))
+
+    def test_is_complete(self):
+        self.assertTrue(is_complete(USAGE[0]))
+        self.assertFalse(is_complete(USAGE[7]))
+
+    def test_has_usage(self):
+        self.assertTrue(has_usage(USAGE[0]))
+        self.assertFalse(has_usage(USAGE[4]))
+        self.assertFalse(has_usage(USAGE[5]))
+
+
+class TestReportStats(D2LStatTestCase):
+    def test_parse_files(self):
+        data = parse_files(self.usage, self.full, self.part, SEMESTER, 10)
+        self.assertEqual(len(data['semester']), 4)
+        self.assertEqual([row[9][-5:] for row in data['semester_no_dup_crn']], ['10001', '10002', '10003'])
+        self.assertEqual([row[3] for row in data['semester_no_dup_r']], ['R001', 'R002', 'R003'])
+        self.assertEqual([row[3] for row in data['full_time']], ['R001'])
+        self.assertEqual([row[3] for row in data['part_time']], ['R002'])
+        self.assertEqual([row[3] for row in data['staff']], ['R003'])
+        self.assertEqual(data['len_full'], 4)
+        self.assertEqual(data['len_part'], 2)
+
+    def test_calculate_stats(self):
+        stats = calculate_stats(parse_files(self.usage, self.full, self.part, SEMESTER, 10))
+        self.assertEqual(stats['courses_with_usage'], 3)
+        self.assertEqual(stats['faculty_with_usage'], 3)
+        self.assertEqual((stats['full_time'], stats['part_time'], stats['staff']), (1, 1, 1))
+        self.assertEqual(stats['specifics'], {'assignments': 1, 'grade': 0, 'graded': 1, 'discussion': 1})
+
+
+class TestFacultyNotUsingD2L(D2LStatTestCase):
+    def test_split(self):
+        result = facultyNotUsingD2LCalculation(self.usage, self.full, self.part, SEMESTER)
+        self.assertIn('The Total Number of Faculty Not Using Desire 2 Learn: 3', result)
+        self.assertIn('The Number of Full Time Faculty Not Using D2L: 1', result)
+        self.assertIn('R004, Green, Dee, Biology', result)
+        self.assertIn('The Number of Part Time Faculty Not Using D2L: 1', result)
+        self.assertIn('R005, White, Eve, History', result)
+        self.assertIn('The Number of Staff Teaching Part Time Faculty Not Using D2L: 1', result)
+        self.assertIn('R006, Black, Fay', result)
+
+
+class TestVirtualClassroomStats(D2LStatTestCase):
+    def test_split(self):
+        result = calculateVirtualClassroomStats(self.usage, self.full, self.part, self.vc)
+        self.assertIn('Number of Instructors That Have Created at Least 1 Virtual Classroom Meeting: 3', result)
+        self.assertIn('The Number of Full Time Faculty Using Virtual Classroom: 1', result)
+        self.assertIn('R001: Ann, Smith', result)
+        self.assertIn('The Number of Part Time Faculty Using Virtual Classroom: 1', result)
+        self.assertIn('R002: Bob, Jones', result)
+        self.assertIn('The Number of Staff Teaching Part Time Using Virtual Classroom: 1', result)
+        self.assertIn('R003: Cal, Brown', result)
@@ -0,0 +1,16 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+
+# Columns read on every request: the session hash check needs password, the permission
+# checks need the flags, and User.__str__ (see models.py) prints the first and last name.
+REQUEST_USER_FIELDS = ('id', 'password', 'username', 'first_name', 'last_name',
+                       'is_active', 'is_staff', 'is_superuser')
+
+
+class SlimUserBackend(ModelBackend):
+    def get_user(self, user_id):
+        try:
+            user = User.objects.only(*REQUEST_USER_FIELDS).get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
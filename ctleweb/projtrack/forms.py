@@ -7,7 +7,7 @@ from .models import Type, Client, Department, Project, Semester
 
 class LoginForm(forms.Form):
     username = forms.CharField(label="Username", max_length=100)
-    password = forms.CharField(label="Password", widget=forms.PasswordInput)
+    password = forms.CharField(label="Password", strip=False, widget=forms.PasswordInput)
 
 
 class AddProjectForm(ModelForm):
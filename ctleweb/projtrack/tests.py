@@ -1,10 +1,13 @@
 import datetime
 
 import django.test
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User as App_User
 # noinspection PyUnresolvedReferences,PyUnresolvedReferences,PyUnresolvedReferences,PyUnresolvedReferences,
 # noinspection PyUnresolvedReferences,PyUnresolvedReferences,PyUnresolvedReferences,PyUnresolvedReferences
-from projtrack.models import Client, Project, Type, User, Department, Semester
+from projtrack.models import Client, Project, Type, User, Department, Semester, CurrentSemester
 
 from .report_generator import check_semester, check_client, check_department, check_type
 
@@ -105,9 +108,126 @@ class TestNavigation(django.test.TestCase):
         self.client.login(username="test", password="password123")
 
     def test_logged_in(self):
-        response = self.client.post("/home/", follow=True)
+        response = self.client.get("/home/", follow=True)
         self.assertContains(response, "Home", status_code=200)
 
+    def test_logged_out(self):
+        self.client.logout()
+        response = self.client.get("/home/")
+        self.assertRedirects(response, "/not_logged_in/?next=/home/")
+
+    @django.test.override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_not_logged_in_revalidates(self):
+        cache.clear()
+        response = self.client.get("/not_logged_in/")
+        self.assertTrue(response.has_header("ETag"))
+        response = self.client.get("/not_logged_in/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_logout_requires_post(self):
+        response = self.client.get("/logout/")
+        self.assertEqual(response.status_code, 405)
+        response = self.client.post("/logout/")
+        self.assertRedirects(response, "/index/")
+
+
+class TestLogin(django.test.TestCase):
+    def setUp(self):
+        App_User.objects.create_user(username="test", email="test@email.com",
+                                     password="password123")
+        self.client = django.test.Client()
+
+    def test_bad_password(self):
+        response = self.client.post("/index/", {'username': "test", 'password': "wrong"})
+        self.assertContains(response, "Invalid username or password.", status_code=401)
+
+    def test_good_password(self):
+        response = self.client.post("/index/", {'username': "test", 'password': "password123"})
+        self.assertRedirects(response, "/home/")
+
+
+@django.test.override_settings(AUTHENTICATION_BACKENDS=['projtrack.backends.SlimUserBackend'])
+class TestSlimUserBackend(django.test.TestCase):
+    def setUp(self):
+        App_User.objects.create_user(username="test", email="test@email.com", password="password123",
+                                     first_name="Ann", last_name="Smith")
+        self.client = django.test.Client()
+        self.assertTrue(self.client.login(username="test", password="password123"))
+
+    def test_home(self):
+        response = self.client.get("/home/")
+        self.assertContains(response, "Ann Smith", status_code=200)
+        self.assertTrue({'email', 'last_login', 'date_joined'} <= response.wsgi_request.user.get_deferred_fields())
+
+    def test_change_password(self):
+        response = self.client.post("/change_password/", {'old_password': "password123",
+                                                          'new_password1': "An0ther-Secret-Pass",
+                                                          'new_password2': "An0ther-Secret-Pass"})
+        self.assertContains(response, "Password changed successfully.", status_code=200)
+        self.assertTrue(App_User.objects.get(username="test").check_password("An0ther-Secret-Pass"))
+        self.assertEqual(self.client.get("/home/").status_code, 200)
+
+
+class TestMyProjects(django.test.TestCase):
+    def setUp(self):
+        semester = Semester.objects.create(name="Fall 2018")
+        CurrentSemester.objects.create(semester=semester)
+        user = App_User.objects.create_user(username="test", email="test@email.com",
+                                            password="password123")
+        other = App_User.objects.create_user(username="other", email="other@email.com",
+                                             password="password123")
+        project_type = Type.objects.create(name="Test")
+        mine = Project.objects.create(title="Mine", description="Mine", date=datetime.date.today(),
+                                      type=project_type, semester=semester)
+        mine.users.add(user)
+        theirs = Project.objects.create(title="Theirs", description="Theirs", date=datetime.date.today(),
+                                        type=project_type, semester=semester)
+        theirs.users.add(other)
+        self.client = django.test.Client()
+        self.client.login(username="test", password="password123")
+
+    def test_only_own_projects(self):
+        response = self.client.get("/my_projects/")
+        self.assertEqual([p.title for p in response.context['projects']], ["Mine"])
+
+
+class TestProjectListQueries(django.test.TestCase):
+    def setUp(self):
+        self.semester = Semester.objects.create(name="Fall 2018")
+        CurrentSemester.objects.create(semester=self.semester)
+        self.user = App_User.objects.create_user(username="test", email="test@email.com",
+                                                 password="password123")
+        self.project_type = Type.objects.create(name="Test")
+        self.department = Department.objects.create(name="Testing")
+        self.add_projects(1)
+        self.client = django.test.Client()
+        self.client.login(username="test", password="password123")
+
+    def add_projects(self, count):
+        for i in range(count):
+            client = Client.objects.create(first_name="Bob", last_name="Roberts%d" % i,
+                                           email="roberts%d@email.com" % i, department=self.department)
+            project = Project.objects.create(title="Project %d" % i, description="Test",
+                                             date=datetime.date.today(), type=self.project_type,
+                                             client=client, semester=self.semester)
+            project.users.add(self.user)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def assert_constant_queries(self, url):
+        before = self.count_queries(url)
+        self.add_projects(5)
+        self.assertEqual(self.count_queries(url), before)
+
+    def test_my_projects(self):
+        self.assert_constant_queries("/my_projects/")
+
+    def test_all_projects(self):
+        self.assert_constant_queries("/all_projects/")
+
 
 class TestReportGenerator(django.test.TestCase):
     def setUp(self):
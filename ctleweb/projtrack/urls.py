@@ -28,7 +28,7 @@ router.register(r'current_semester', views.CurrentSemesterSerializerView, base_n
 urlpatterns = [
     url(r'^$', views.index, name='index'),
     url(r'^index/$', views.index, name='index'),
-    url(r'^home/$', views.home, name='home'),
+    url(r'^home/$', views.AuthTemplateView.as_view(template_name='projtrack/home.html'), name='home'),
     url(r'^change_password/$', views.change_password, name='change_password'),
     url(r'^add_project/$', views.add_project, name='add_project'),
     url(r'^add_client/$', views.add_client, name='add_client'),
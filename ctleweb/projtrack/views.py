@@ -1,21 +1,43 @@
 import datetime
 
 from django.contrib.auth import authenticate, login, logout, update_session_auth_hash
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.forms import PasswordChangeForm
 from django.contrib.auth.models import User
 from django.core.exceptions import ObjectDoesNotExist
-from django.shortcuts import redirect, get_object_or_404
-from django.shortcuts import render
+from django.db import transaction
+from django.http import HttpResponseRedirect
+from django.shortcuts import get_object_or_404, redirect, render
+from django.template.response import TemplateResponse
+from django.urls import reverse_lazy
+from django.views.decorators.cache import cache_control, cache_page
+from django.views.decorators.http import conditional_page, require_POST
+from django.views.generic import TemplateView
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 
-from .forms import AddProjectForm, AddClientForm, AddDeptForm, AddTypeForm, GenerateReportForm
-from .forms import LoginForm
+from .forms import AddProjectForm, AddClientForm, AddDeptForm, AddTypeForm, GenerateReportForm, LoginForm
 from .models import Client, Project, CurrentSemester, Department, Type, Semester
 from .report_generator import Report
 from .serializers import ProjectSerializer, TypeSerializer, DepartmentSerializer, ClientSerializer, SemesterSerializer, \
     UserSerializer, CurrentSemesterSerializer
 
+HOME_URL = reverse_lazy('projtrack:home')
+INDEX_URL = reverse_lazy('projtrack:index')
+NOT_LOGGED_IN_URL = reverse_lazy('projtrack:not_logged_in')
+
+EMPTY_LOGIN_FORM = None
+
+
+class AuthTemplateView(LoginRequiredMixin, TemplateView):
+    login_url = NOT_LOGGED_IN_URL
+
+    def get_context_data(self, **kwargs):
+        context = super(AuthTemplateView, self).get_context_data(**kwargs)
+        context['user'] = self.request.user
+        return context
+
 
 # noinspection PyUnusedLocal
 def issues(request):
@@ -27,125 +49,126 @@ def wiki(request):
     return redirect('https://github.com/cyclerdan/Projtrack3/wiki')
 
 
+def empty_login_form():
+    # An unbound form holds no per-request state, so one instance is built on first use and shared by every GET.
+    global EMPTY_LOGIN_FORM
+    if EMPTY_LOGIN_FORM is None:
+        EMPTY_LOGIN_FORM = LoginForm()
+    return EMPTY_LOGIN_FORM
+
+
+def current_projects(user=None):
+    # Every project list shows each project's client, and the full list also shows its users, so both are
+    # loaded up front instead of once per row. Pass a user to list only the projects they are assigned to.
+    # noinspection PyUnresolvedReferences
+    projects = Project.objects.filter(semester=CurrentSemester.objects.all()[0].semester) \
+        .select_related('client').order_by('-date')
+    if user is None:
+        return projects.prefetch_related('users')
+    return projects.filter(users=user)
+
+
 def index(request):
     if request.user.is_authenticated:
-        return redirect('projtrack:home')
+        return HttpResponseRedirect(HOME_URL)
     if request.method == 'POST':
         form = LoginForm(request.POST)
         if form.is_valid():
-            user = authenticate(username=request.POST['username'],
-                                password=request.POST['password'])
+            user = authenticate(request,
+                                username=form.cleaned_data['username'],
+                                password=form.cleaned_data['password'])
             if user is not None:
                 login(request, user)
-                return redirect('projtrack:home')
-            else:
-                return render(request,
-                              'projtrack/index.html',
-                              {'user': request.user,
-                               'error_message': "Invalid username or password.",
-                               'form': form})
-    else:
-        form = LoginForm()
-        return render(request, 'projtrack/index.html', {'form': form, 'user': request.user})
-
-
-def home(request):
-    if request.user.is_authenticated:
-        return render(request, 'projtrack/home.html', {'user': request.user})
+                return HttpResponseRedirect(HOME_URL)
+        return render(request,
+                      'projtrack/index.html',
+                      {'user': request.user,
+                       'error_message': "Invalid username or password.",
+                       'form': form},
+                      status=401)
     else:
-        return redirect('projtrack:not_logged_in')
+        return TemplateResponse(request, 'projtrack/index.html', {'form': empty_login_form(), 'user': request.user})
 
 
+@login_required(login_url=NOT_LOGGED_IN_URL)
 def report_page(request):
     semester = CurrentSemester.objects.get()
-    if request.user.is_authenticated:
-        if request.method == "POST":
-            form = GenerateReportForm(request.POST)
-            if form.is_valid():
-                req = {
-                    'start_date': (
-                        request.POST['start_date_month'] + "/" +
-                        request.POST['start_date_day'] + "/" +
-                        request.POST['start_date_year']
-                    ),
-                    'end_date': (
-                        request.POST['end_date_month'] + "/" +
-                        request.POST['end_date_day'] + "/" +
-                        request.POST['end_date_year']
-                    ),
-                    'semester': request.POST['semester'],
-                    'user': request.POST['user'],
-                    'client': request.POST['client'],
-                    'department': request.POST['department'],
-                    'proj_type': request.POST['proj_type'],
-                    'stats': True if request.POST.get('show_stats') is not None else False
-                }
-                Report(req)
-                return render(request, 'projtrack/report_page.html')
-        else:
-            form = GenerateReportForm()
-            return render(request,
-                          'projtrack/report_generator.html',
-                          {'user': request.user,
-                           'title_text': 'Generate a Report',
-                           'form': form,
-                           'semester': semester})
+    if request.method == "POST":
+        form = GenerateReportForm(request.POST)
+        if form.is_valid():
+            req = {
+                'start_date': (
+                    request.POST['start_date_month'] + "/" +
+                    request.POST['start_date_day'] + "/" +
+                    request.POST['start_date_year']
+                ),
+                'end_date': (
+                    request.POST['end_date_month'] + "/" +
+                    request.POST['end_date_day'] + "/" +
+                    request.POST['end_date_year']
+                ),
+                'semester': request.POST['semester'],
+                'user': request.POST['user'],
+                'client': request.POST['client'],
+                'department': request.POST['department'],
+                'proj_type': request.POST['proj_type'],
+                'stats': True if request.POST.get('show_stats') is not None else False
+            }
+            Report(req)
+            return render(request, 'projtrack/report_page.html')
     else:
-        return redirect('projtrack:not_logged_in')
+        form = GenerateReportForm()
+        return render(request,
+                      'projtrack/report_generator.html',
+                      {'user': request.user,
+                       'title_text': 'Generate a Report',
+                       'form': form,
+                       'semester': semester})
 
 
+@login_required(login_url=NOT_LOGGED_IN_URL)
 def my_projects(request):
-    if request.user.is_authenticated:
-        try:
-            projects = []
-            u = User.objects.get(username=request.user.username)
-            # noinspection PyUnresolvedReferences
-            query = Project.objects.filter(semester=CurrentSemester.objects.all()[0].semester).order_by('-date')
-            for x in query:
-                if u in x.users.all():
-                    projects.append(x)
-        except ObjectDoesNotExist:
-            projects = ""
-        return render(request, 'projtrack/my_projects.html',
-                      {'user': request.user,
-                       'title_text': 'My Projects',
-                       'projects': projects})
-    else:
-        return redirect('projtrack:not_logged_in')
+    try:
+        projects = current_projects(request.user)
+    except ObjectDoesNotExist:
+        projects = ""
+    return TemplateResponse(request, 'projtrack/my_projects.html',
+                            {'user': request.user,
+                             'title_text': 'My Projects',
+                             'projects': projects})
 
 
+@login_required(login_url=NOT_LOGGED_IN_URL)
 def all_projects(request):
-    if request.user.is_authenticated:
-        # noinspection PyUnresolvedReferences
-        try:
-            projects = Project.objects.filter(semester=CurrentSemester.objects.all()[0].semester).order_by('-date')
-        except ObjectDoesNotExist:
-            projects = ""
-        return render(request, 'projtrack/all_projects.html',
-                      {'user': request.user,
-                       'title_text': "All Projects",
-                       'list_view': projects})
-    else:
-        return redirect('projtrack:not_logged_in')
+    try:
+        projects = current_projects()
+    except ObjectDoesNotExist:
+        projects = ""
+    return TemplateResponse(request, 'projtrack/all_projects.html',
+                            {'user': request.user,
+                             'title_text': "All Projects",
+                             'list_view': projects})
 
 
+@login_required(login_url=NOT_LOGGED_IN_URL)
 def add_project(request):
     error = ""
     semester = CurrentSemester.objects.get()
-    if request.user.is_authenticated:
-        if request.method == 'POST':
-            project_form = AddProjectForm(request.POST, prefix='project')
-            if project_form.is_valid():
-                t = project_form.save(commit=False)
-                t.date = str(datetime.date.today())
-                t.semester = CurrentSemester.objects.all()[0].semester
+    if request.method == 'POST':
+        project_form = AddProjectForm(request.POST, prefix='project')
+        if project_form.is_valid():
+            t = project_form.save(commit=False)
+            t.date = str(datetime.date.today())
+            t.semester = CurrentSemester.objects.all()[0].semester
+            with transaction.atomic():
                 if request.POST.get('project-client') == '':
                     try:
                         dept = Department.objects.get(pk=request.POST['project-client_department'])
                     except ValueError:
-                        return render(request, 'projtrack/add_project.html',
-                                      {'user': request.user, 'title_text': "Add Project", 'form': project_form,
-                                       'error_message': "Missing Client requirement."})
+                        return TemplateResponse(request, 'projtrack/add_project.html',
+                                                {'user': request.user, 'title_text': "Add Project",
+                                                 'form': project_form,
+                                                 'error_message': "Missing Client requirement."})
                     t.client = Client.objects.create(first_name=request.POST['project-client_first_name'],
                                                      last_name=request.POST['project-client_last_name'],
                                                      email=request.POST['project-client_email'],
@@ -153,203 +176,180 @@ def add_project(request):
                 t.save()
                 for i in request.POST.getlist("users"):
                     t.users.add(User.objects.get(pk=i))
-                t.save()
                 project_form.save_m2m()
-                project_form = AddProjectForm(prefix='project')
-                error = "Form submitted successfully."
-            else:
-                error = "Form is invalid."
-        else:
             project_form = AddProjectForm(prefix='project')
-        return render(request, 'projtrack/add_project.html',
-                      {'user': request.user,
-                       'title_text': "Add Project",
-                       'form': project_form,
-                       'error_message': error,
-                       'semester': semester})
+            error = "Form submitted successfully."
+        else:
+            error = "Form is invalid."
     else:
-        return redirect('projtrack:not_logged_in')
+        project_form = AddProjectForm(prefix='project')
+    return TemplateResponse(request, 'projtrack/add_project.html',
+                            {'user': request.user,
+                             'title_text': "Add Project",
+                             'form': project_form,
+                             'error_message': error,
+                             'semester': semester})
 
 
+@login_required(login_url=NOT_LOGGED_IN_URL)
 def add_client(request):
     error = ""
-    if request.user.is_authenticated:
-        if request.method == 'POST':
-            form = AddClientForm(request.POST)
-            if form.is_valid():
-                t = form.save()
-                t.save()
-                form = AddClientForm()
-                error = "Form submitted successfully."
-            else:
-                error = "Form is invalid."
-        else:
+    if request.method == 'POST':
+        form = AddClientForm(request.POST)
+        if form.is_valid():
+            form.save()
             form = AddClientForm()
-        return render(request, 'projtrack/add_client.html',
-                      {'user': request.user,
-                       'title_text': "Add Client",
-                       'form': form,
-                       'error_message': error})
+            error = "Form submitted successfully."
+        else:
+            error = "Form is invalid."
     else:
-        return redirect('projtrack:not_logged_in')
+        form = AddClientForm()
+    return render(request, 'projtrack/add_client.html',
+                  {'user': request.user,
+                   'title_text': "Add Client",
+                   'form': form,
+                   'error_message': error})
 
 
+@login_required(login_url=NOT_LOGGED_IN_URL)
 def client_view(request):
-    if request.user.is_authenticated:
-        # noinspection PyUnresolvedReferences
-        clients = Client.objects.all().order_by('last_name')
-        return render(request, 'projtrack/list_view.html',
-                      {'title_text': "All Clients",
-                       'user': request.user,
-                       'list_view': clients})
-    else:
-        return redirect('projtrack:not_logged_in')
+    # noinspection PyUnresolvedReferences
+    clients = Client.objects.select_related('department').order_by('last_name')
+    return render(request, 'projtrack/list_view.html',
+                  {'title_text': "All Clients",
+                   'user': request.user,
+                   'list_view': clients})
 
 
 # noinspection PyShadowingBuiltins
+@login_required(login_url=NOT_LOGGED_IN_URL)
 def client_projects(request, id=None):
-    if request.user.is_authenticated:
+    # noinspection PyUnresolvedReferences
+    client = Client.objects.get(id=id)
+    try:
         # noinspection PyUnresolvedReferences
-        client = Client.objects.get(id=id)
-        try:
-            # noinspection PyUnresolvedReferences
-            projects = list(Project.objects.filter(client=client))
-        except TypeError:
-            # noinspection PyUnresolvedReferences
-            projects = [Project.objects.get(client=client)]
-        return render(request, 'projtrack/client_projects.html',
-                      {'title_text': "Projects for " + str(client),
-                       'user': request.user,
-                       'list_view': projects})
-    else:
-        return redirect('projtrack:not_logged_in')
+        projects = list(Project.objects.filter(client=client).select_related('type').prefetch_related('users'))
+    except TypeError:
+        # noinspection PyUnresolvedReferences
+        projects = [Project.objects.get(client=client)]
+    return render(request, 'projtrack/client_projects.html',
+                  {'title_text': "Projects for " + str(client),
+                   'user': request.user,
+                   'list_view': projects})
 
 
 # noinspection PyShadowingBuiltins
+@login_required(login_url=NOT_LOGGED_IN_URL)
 def edit_project(request, id=None):
     error = ""
-    if request.user.is_authenticated:
-        if request.method == 'POST':
-            # noinspection PyUnresolvedReferences
-            form = AddProjectForm(request.POST or None, instance=Project.objects.get(id=id))
-            if form.is_valid():
-                t = form.save()
-                t.save()
-                form = AddProjectForm()
-                error = "Form submitted successfully."
-            else:
-                error = "Form is invalid."
+    if request.method == 'POST':
+        # noinspection PyUnresolvedReferences
+        form = AddProjectForm(request.POST or None, instance=Project.objects.get(id=id))
+        if form.is_valid():
+            form.save()
+            form = AddProjectForm()
+            error = "Form submitted successfully."
         else:
-            project = get_object_or_404(Project, pk=id)
-            form = AddProjectForm(instance=project)
-        return render(request, 'projtrack/project_edit.html',
-                      {'user': request.user,
-                       'title_text': "Edit Project",
-                       'form': form,
-                       'error_message': error,
-                       'id': id})
+            error = "Form is invalid."
     else:
-        return redirect('projtrack:not_logged_in')
+        project = get_object_or_404(Project, pk=id)
+        form = AddProjectForm(instance=project)
+    return render(request, 'projtrack/project_edit.html',
+                  {'user': request.user,
+                   'title_text': "Edit Project",
+                   'form': form,
+                   'error_message': error,
+                   'id': id})
 
 
 # noinspection PyShadowingBuiltins
+@login_required(login_url=NOT_LOGGED_IN_URL)
 def project_delete(request, id=None):
-    if request.user.is_authenticated:
-        try:
-            p = get_object_or_404(Project, pk=id)
-            projects = []
-            u = User.objects.get(username=request.user.username)
-            # noinspection PyUnresolvedReferences
-            Project.objects.filter(id=p.id).delete()
-            # noinspection PyUnresolvedReferences
-            query = Project.objects.all().order_by('title')
-            for x in query:
-                if u in x.users.all:
-                    projects.append(x)
-        except ObjectDoesNotExist:
-            projects = ""
-        return render(request, 'projtrack/my_projects.html',
-                      {'user': request.user,
-                       'title_text': 'My Projects',
-                       'projects': projects})
-    else:
-        return redirect('projtrack:not_logged_in')
+    try:
+        p = get_object_or_404(Project, pk=id)
+        # noinspection PyUnresolvedReferences
+        Project.objects.filter(id=p.id).delete()
+        # noinspection PyUnresolvedReferences
+        projects = Project.objects.filter(users=request.user).select_related('client').order_by('title')
+    except ObjectDoesNotExist:
+        projects = ""
+    return render(request, 'projtrack/my_projects.html',
+                  {'user': request.user,
+                   'title_text': 'My Projects',
+                   'projects': projects})
 
 
+@login_required(login_url=NOT_LOGGED_IN_URL)
 def add_department(request):
     error = ""
-    if request.user.is_authenticated:
-        if request.method == 'POST':
-            form = AddDeptForm(request.POST)
-            if form.is_valid():
-                d = form.save()
-                d.save()
-                form = AddDeptForm()
-                error = "Form submitted successfully."
-            else:
-                error = "Form is invalid."
-        else:
+    if request.method == 'POST':
+        form = AddDeptForm(request.POST)
+        if form.is_valid():
+            form.save()
             form = AddDeptForm()
-        return render(request, 'projtrack/add_department.html',
-                      {'user': request.user,
-                       'title_text': "Add Department",
-                       'form': form,
-                       'error_message': error})
+            error = "Form submitted successfully."
+        else:
+            error = "Form is invalid."
     else:
-        return redirect('projtrack:not_logged_in')
+        form = AddDeptForm()
+    return render(request, 'projtrack/add_department.html',
+                  {'user': request.user,
+                   'title_text': "Add Department",
+                   'form': form,
+                   'error_message': error})
 
 
+@login_required(login_url=NOT_LOGGED_IN_URL)
 def add_type(request):
     error = ""
-    if request.user.is_authenticated:
-        if request.method == 'POST':
-            form = AddTypeForm(request.POST)
-            if form.is_valid():
-                t = form.save()
-                t.save()
-                form = AddTypeForm()
-                error = "Form submitted successfully."
-            else:
-                error = "Form is invalid."
-        else:
+    if request.method == 'POST':
+        form = AddTypeForm(request.POST)
+        if form.is_valid():
+            form.save()
             form = AddTypeForm()
-        return render(request, 'projtrack/add_type.html',
-                      {'user': request.user,
-                       'title_text': "Add Type",
-                       'form': form,
-                       'error_message': error})
+            error = "Form submitted successfully."
+        else:
+            error = "Form is invalid."
     else:
-        return redirect('projtrack:not_logged_in')
+        form = AddTypeForm()
+    return render(request, 'projtrack/add_type.html',
+                  {'user': request.user,
+                   'title_text': "Add Type",
+                   'form': form,
+                   'error_message': error})
 
 
+@conditional_page
+@cache_control(public=True, max_age=60 * 60)
+@cache_page(60 * 60)
 def not_logged_in(request):
+    # A plain HttpResponse, so conditional_page can turn cached hits into 304s as well.
     return render(request, 'projtrack/not_logged_in.html')
 
 
+@require_POST
 def logout_view(request):
     logout(request)
-    return redirect('projtrack:index')
+    return HttpResponseRedirect(INDEX_URL)
 
 
+@login_required(login_url=NOT_LOGGED_IN_URL)
 def change_password(request):
     error = ''
-    if request.user.is_authenticated:
-        if request.method == 'POST':
-            form = PasswordChangeForm(request.user, request.POST)
-            if form.is_valid():
-                user = form.save()
-                update_session_auth_hash(request, user)
-                error = 'Password changed successfully.'
-            else:
-                error = 'Something went wrong.'
+    if request.method == 'POST':
+        form = PasswordChangeForm(request.user, request.POST)
+        if form.is_valid():
+            user = form.save()
+            update_session_auth_hash(request, user)
+            error = 'Password changed successfully.'
         else:
-            form = PasswordChangeForm(request.user)
-        return render(request, 'projtrack/change_password.html',
-                      {'user': request.user,
-                       'form': form,
-                       'error_message': error})
+            error = 'Something went wrong.'
     else:
-        return redirect('projtrack:not_logged_in')
+        form = PasswordChangeForm(request.user)
+    return render(request, 'projtrack/change_password.html',
+                  {'user': request.user,
+                   'form': form,
+                   'error_message': error})
 
 
 class UserSerializerView(viewsets.ModelViewSet):